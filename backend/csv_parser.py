@@ -1,11 +1,108 @@
+import os
 import pandas as pd
+import numpy as np
 import csv
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 import re
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process, utils
+from charset_normalizer import from_bytes
 from io import StringIO
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    NUMBA_AVAILABLE = False
+
+# Rows above this threshold amortize the one-time JIT compile of the numba
+# currency kernel; below it the pandas vectorized path wins
+NUMBA_MIN_ROWS = 50_000
+
+# CSVs above this size are read in chunks instead of loaded whole, which
+# avoids holding a second whole-file DataFrame alongside its groupby
+# copies (peak memory still grows with file size; see
+# _parse_csv_streaming)
+STREAM_MIN_BYTES = 50 * 1024 * 1024
+STREAM_CHUNK_ROWS = 100_000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _parse_currency_kernel(buf, starts, ends):  # pragma: no cover - compiled
+        """Parse currency strings from a flat byte buffer into float64"""
+        out = np.empty(len(starts), dtype=np.float64)
+        for i in prange(len(starts)):
+            int_part = 0.0
+            frac_part = 0.0
+            scale = 1.0
+            negative = False
+            after_dot = False
+            any_digit = False
+            for j in range(starts[i], ends[i]):
+                c = buf[j]
+                if 48 <= c <= 57:
+                    any_digit = True
+                    digit = c - 48
+                    if after_dot:
+                        scale *= 10.0
+                        frac_part += digit / scale
+                    else:
+                        int_part = int_part * 10.0 + digit
+                elif c == 46:  # '.'
+                    after_dot = True
+                elif c == 45:  # '-'
+                    negative = True
+            value = int_part + frac_part
+            if negative:
+                value = -value
+            out[i] = value if any_digit else 0.0
+        return out
+
+
+def _parse_currency_column_numba(values: 'np.ndarray') -> 'np.ndarray':
+    """Flatten a string column into one byte buffer and run the JIT kernel"""
+    encoded = [str(v).encode('utf-8', 'ignore') for v in values]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return _parse_currency_kernel(buf, starts, ends)
+
+# Fast-path date patterns: one compiled regex with an alternation per common
+# format, so strptime (and its ValueError unwinding) only runs for strings
+# none of these match
+_DATE_RE = re.compile(r"""
+    ^(?:
+        (?P<iso_y>\d{4})[-/](?P<iso_m>\d{1,2})[-/](?P<iso_d>\d{1,2})        # 2024-01-15
+      | (?P<us_m>\d{1,2})[/-](?P<us_d>\d{1,2})[/-](?P<us_y>\d{2}(?:\d{2})?) # 01/15/2024
+      | (?P<mn_b>[A-Za-z]+)\s+(?P<mn_d>\d{1,2}),\s*(?P<mn_y>\d{4})          # January 15, 2024
+      | (?P<dn_d>\d{1,2})\s+(?P<dn_b>[A-Za-z]+)\s+(?P<dn_y>\d{4})           # 15 January 2024
+    )$
+""", re.VERBOSE)
+
+# Fallback strptime formats, tried in order when the regex fast path misses
+_DATE_FORMATS = [
+    '%m/%d/%Y', '%Y-%m-%d', '%d/%m/%Y', '%m-%d-%Y',
+    '%d-%m-%Y', '%Y/%m/%d', '%B %d, %Y', '%d %B %Y',
+    '%m/%d/%y', '%d/%m/%y'
+]
+
+# Strips currency symbols, thousands separators and other non-numeric noise
+_CURRENCY_RE = re.compile(r'[^0-9.\-]')
+
+_MONTH_NAMES = {
+    name: num for num, name in enumerate(
+        ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+         'august', 'september', 'october', 'november', 'december'], start=1)
+}
+
+def _expand_year(year: int) -> int:
+    """Apply strptime's two-digit year pivot (00-68 -> 2000s, 69-99 -> 1900s)"""
+    if year >= 100:
+        return year
+    return year + 2000 if year < 69 else year + 1900
+
 # Column mappings for 180+ accounting software variations
 COLUMN_MAPPINGS = {
     # QuickBooks variations
@@ -27,57 +124,94 @@ COLUMN_MAPPINGS = {
 }
 
 class CSVParser:
+    # Mapped fields that hold numeric / date values, used for whole-column
+    # coercion before rows are iterated
+    NUMERIC_FIELDS = ('quantity', 'rate', 'amount', 'subtotal',
+                      'tax_rate', 'tax_amount', 'total')
+    DATE_FIELDS = ('invoice_date', 'due_date')
+
     def __init__(self):
         self.column_mappings = COLUMN_MAPPINGS
-        
+        # Flat variation list plus per-field slices, so detect_column_mapping
+        # can score every (column, variation) pair in a single cdist call.
+        # Targets are normalized once here instead of inside every fuzz call.
+        self._flat_targets = []
+        self._field_slices = {}
+        for field, variations in self.column_mappings.items():
+            start = len(self._flat_targets)
+            self._flat_targets.extend(utils.default_process(t) for t in variations)
+            self._field_slices[field] = slice(start, len(self._flat_targets))
+        # Reverse dict for the exact-match fast path; first field wins when
+        # a variation appears under several fields (matches iteration order)
+        self._exact_lookup = {}
+        for field, variations in self.column_mappings.items():
+            for variation in variations:
+                self._exact_lookup.setdefault(utils.default_process(variation), field)
+
     def fuzzy_match_column(self, column_name: str, target_columns: List[str]) -> Optional[str]:
         """Use fuzzy matching to find the best matching column"""
         column_name = column_name.lower().strip()
-        best_match = None
-        best_score = 0
-        
-        for target in target_columns:
-            score = fuzz.ratio(column_name, target)
-            if score > best_score and score > 70:  # 70% similarity threshold
-                best_score = score
-                best_match = target
-        
-        return best_match
+
+        # rapidfuzz scores the whole target list in one C call
+        result = process.extractOne(
+            column_name, target_columns, scorer=fuzz.ratio, score_cutoff=70
+        )
+        return result[0] if result else None
     
     def detect_column_mapping(self, df_columns: List[str]) -> Dict[str, str]:
         """Detect which columns in the CSV correspond to our standard fields"""
+        # Users re-upload the same export format repeatedly; cache the full
+        # fuzzy sweep keyed on the column-name signature
+        cols_key = tuple(str(c) for c in df_columns)
+        return dict(self._detect_column_mapping_cached(cols_key))
+
+    @lru_cache(maxsize=256)
+    def _detect_column_mapping_cached(self, df_columns: Tuple[str, ...]) -> Dict[str, str]:
         mapping = {}
-        used_columns = set()
-        
-        for standard_field, variations in self.column_mappings.items():
-            best_match = None
+        used_rows = set()
+
+        cols_lower = [utils.default_process(c) for c in df_columns]
+
+        # Round 1: exact lookup - most real-world headers match a variation
+        # verbatim and never need fuzzy scoring
+        for row, col_norm in enumerate(cols_lower):
+            field = self._exact_lookup.get(col_norm)
+            if field and field not in mapping:
+                mapping[field] = df_columns[row]
+                used_rows.add(row)
+
+        unresolved = [row for row in range(len(df_columns)) if row not in used_rows]
+        if not unresolved:
+            return mapping
+
+        # Round 2: fuzzy-score only the unresolved columns in one
+        # vectorized call
+        scores = process.cdist(
+            [cols_lower[row] for row in unresolved], self._flat_targets,
+            scorer=fuzz.ratio, score_cutoff=70, workers=-1, dtype=np.uint8
+        )
+
+        taken = set()
+        for standard_field, field_slice in self._field_slices.items():
+            if standard_field in mapping:
+                continue
+
+            # Best variation score per unresolved CSV column for this field
+            field_scores = scores[:, field_slice].max(axis=1)
+
             best_score = 0
-            best_col = None
-            
-            for col in df_columns:
-                if col in used_columns:
+            best_idx = -1
+            for idx, score in enumerate(field_scores):
+                if idx in taken:
                     continue
-                    
-                col_lower = col.lower().strip()
-                
-                # Check for exact match first
-                if col_lower in variations:
-                    best_col = col
-                    best_score = 100
-                    break
-                
-                # Try fuzzy matching
-                for target in variations:
-                    score = fuzz.ratio(col_lower, target)
-                    if score > best_score and score > 70:
-                        best_score = score
-                        best_match = target
-                        best_col = col
-            
-            if best_col:
-                mapping[standard_field] = best_col
-                used_columns.add(best_col)
-        
+                if score > best_score:
+                    best_score = score
+                    best_idx = idx
+
+            if best_score >= 70:
+                mapping[standard_field] = df_columns[unresolved[best_idx]]
+                taken.add(best_idx)
+
         return mapping
     
     def parse_date(self, date_str: Any) -> Optional[datetime]:
@@ -89,15 +223,34 @@ class CSVParser:
             return date_str
         
         date_str = str(date_str).strip()
-        
-        # Common date formats
-        formats = [
-            '%m/%d/%Y', '%Y-%m-%d', '%d/%m/%Y', '%m-%d-%Y',
-            '%d-%m-%Y', '%Y/%m/%d', '%B %d, %Y', '%d %B %Y',
-            '%m/%d/%y', '%d/%m/%y'
-        ]
-        
-        for fmt in formats:
+
+        # Fast path: dispatch on the compiled regex instead of trying
+        # strptime formats one by one
+        m = _DATE_RE.match(date_str)
+        if m:
+            try:
+                if m.group('iso_y'):
+                    return datetime(int(m.group('iso_y')),
+                                    int(m.group('iso_m')), int(m.group('iso_d')))
+                if m.group('us_y'):
+                    month, day = int(m.group('us_m')), int(m.group('us_d'))
+                    # Month-first like the strptime order below; fall back to
+                    # day-first when the first number can't be a month
+                    if month > 12 and day <= 12:
+                        month, day = day, month
+                    return datetime(_expand_year(int(m.group('us_y'))), month, day)
+                if m.group('mn_y'):
+                    month = _MONTH_NAMES.get(m.group('mn_b').lower())
+                    if month:
+                        return datetime(int(m.group('mn_y')), month, int(m.group('mn_d')))
+                if m.group('dn_y'):
+                    month = _MONTH_NAMES.get(m.group('dn_b').lower())
+                    if month:
+                        return datetime(int(m.group('dn_y')), month, int(m.group('dn_d')))
+            except ValueError:
+                pass  # Out-of-range day/month; let strptime have a try
+
+        for fmt in _DATE_FORMATS:
             try:
                 return datetime.strptime(date_str, fmt)
             except ValueError:
@@ -115,26 +268,58 @@ class CSVParser:
         
         # Remove currency symbols and commas
         cleaned = str(num_str).strip()
-        cleaned = re.sub(r'[^0-9.-]', '', cleaned)
+        cleaned = _CURRENCY_RE.sub('', cleaned)
         
         try:
             return float(cleaned) if cleaned else 0.0
         except ValueError:
             return 0.0
     
+    def _coerce_mapped_columns(self, df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+        """Vectorize number/date parsing over whole columns up front, so the
+        per-row parse_number/parse_date calls see already-typed values"""
+        df = df.copy()
+
+        use_numba = NUMBA_AVAILABLE and len(df) > NUMBA_MIN_ROWS
+
+        for field in self.NUMERIC_FIELDS:
+            col = mapping.get(field)
+            if col and col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                if use_numba:
+                    # Parallel JIT kernel over a flat byte buffer; only worth
+                    # the compile cost on very large exports
+                    df[col] = _parse_currency_column_numba(df[col].to_numpy())
+                else:
+                    df[col] = pd.to_numeric(
+                        df[col].astype(str).str.replace(_CURRENCY_RE, '', regex=True),
+                        errors='coerce'
+                    ).fillna(0.0)
+
+        for field in self.DATE_FIELDS:
+            col = mapping.get(field)
+            if col and col in df.columns:
+                df[col] = pd.to_datetime(df[col], errors='coerce', format='mixed')
+
+        return df
+
     def split_invoices(self, df: pd.DataFrame, mapping: Dict[str, str]) -> List[Dict[str, Any]]:
         """Split a multi-invoice CSV into individual invoices"""
         invoices = []
-        
+
+        # Coerce mapped columns once instead of re-parsing cell by cell
+        df = self._coerce_mapped_columns(df, mapping)
+
         if 'invoice_number' not in mapping:
             # Single invoice file - treat all rows as one invoice
             return [self.parse_invoice_rows(df, mapping)]
         
         invoice_col = mapping['invoice_number']
         
-        # Group rows by invoice number
-        for invoice_num, group in df.groupby(invoice_col):
-            if pd.notna(invoice_num) and str(invoice_num).strip():
+        # Group rows by invoice number; sort=False skips an O(N log N) key
+        # sort and dropna=True replaces the per-group notna check
+        for invoice_num, group in df.groupby(invoice_col, sort=False,
+                                             dropna=True, observed=True):
+            if str(invoice_num).strip():
                 invoice_data = self.parse_invoice_rows(group, mapping)
                 if invoice_data:
                     invoices.append(invoice_data)
@@ -147,57 +332,86 @@ class CSVParser:
             return None
         
         first_row = df.iloc[0]
-        
+
+        # Resolve mapped column names into locals once; every access below
+        # was previously a .get(mapping.get(...)) double dict lookup
+        num_col = mapping.get('invoice_number')
+        date_col = mapping.get('invoice_date')
+        due_col = mapping.get('due_date')
+        name_col = mapping.get('client_name')
+        email_col = mapping.get('client_email')
+        addr_col = mapping.get('client_address')
+        notes_col = mapping.get('notes')
+        tax_amount_col = mapping.get('tax_amount')
+        tax_rate_col = mapping.get('tax_rate')
+
         # Extract invoice-level data from first row
-        invoice_number = str(first_row.get(mapping.get('invoice_number', ''), '')).strip()
+        invoice_number = str(first_row.get(num_col, '')).strip() if num_col else ''
         if not invoice_number:
             invoice_number = f"INV-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        
-        invoice_date = self.parse_date(first_row.get(mapping.get('invoice_date', '')))
+
+        invoice_date = self.parse_date(first_row.get(date_col)) if date_col else None
         if not invoice_date:
             invoice_date = datetime.now()
-        
-        due_date_raw = first_row.get(mapping.get('due_date', ''))
-        due_date = self.parse_date(due_date_raw) if 'due_date' in mapping else None
-        
+
+        due_date = self.parse_date(first_row.get(due_col)) if due_col else None
+
         invoice_data = {
             'invoice_number': invoice_number,
-            'invoice_date': invoice_date,
-            'due_date': due_date,
-            'client_name': str(first_row.get(mapping.get('client_name', ''), 'Unknown Client')).strip(),
-            'client_email': str(first_row.get(mapping.get('client_email', ''), '')).strip() if 'client_email' in mapping else None,
-            'client_address': str(first_row.get(mapping.get('client_address', ''), '')).strip() if 'client_address' in mapping else None,
-            'notes': str(first_row.get(mapping.get('notes', ''), '')).strip() if 'notes' in mapping else None,
+            # Emit ISO-8601 strings so the JSON boundary serializes dates
+            # without per-object default= hook fallbacks
+            'invoice_date': invoice_date.isoformat(),
+            'due_date': due_date.isoformat() if due_date else None,
+            'client_name': str(first_row.get(name_col, 'Unknown Client')).strip() if name_col else 'Unknown Client',
+            'client_email': str(first_row.get(email_col, '')).strip() if email_col else None,
+            'client_address': str(first_row.get(addr_col, '')).strip() if addr_col else None,
+            'notes': str(first_row.get(notes_col, '')).strip() if notes_col else None,
         }
         
-        # Parse line items
+        # Parse line items from plain numpy arrays - iterrows boxes every row
+        # into a Series and is the slowest pandas iteration idiom
         line_items = []
-        for _, row in df.iterrows():
-            description = str(row.get(mapping.get('description', ''), '')).strip()
-            if not description:
-                continue
-            
-            quantity = self.parse_number(row.get(mapping.get('quantity', ''), 1.0))
-            rate = self.parse_number(row.get(mapping.get('rate', ''), 0.0))
-            amount = self.parse_number(row.get(mapping.get('amount', ''), 0.0))
-            
-            # Calculate amount if not provided
-            if amount == 0.0 and quantity > 0 and rate > 0:
-                amount = quantity * rate
-            
-            line_items.append({
-                'description': description,
-                'quantity': quantity,
-                'rate': rate,
-                'amount': amount
-            })
+        desc_col = mapping.get('description')
+        if desc_col and desc_col in df.columns:
+            n_rows = len(df)
+            descriptions = df[desc_col].astype(str).str.strip().to_numpy()
+            qty_col = mapping.get('quantity')
+            rate_col = mapping.get('rate')
+            amt_col = mapping.get('amount')
+            quantities = df[qty_col].to_numpy() if qty_col in df.columns else np.full(n_rows, 1.0)
+            rates = df[rate_col].to_numpy() if rate_col in df.columns else np.zeros(n_rows)
+            amounts = df[amt_col].to_numpy() if amt_col in df.columns else np.zeros(n_rows)
+
+            for description, quantity, rate, amount in zip(descriptions, quantities, rates, amounts):
+                if not description:
+                    continue
+
+                quantity = self.parse_number(quantity)
+                rate = self.parse_number(rate)
+                amount = self.parse_number(amount)
+
+                # Calculate amount if not provided
+                if amount == 0.0 and quantity > 0 and rate > 0:
+                    amount = quantity * rate
+
+                line_items.append({
+                    'description': description,
+                    'quantity': quantity,
+                    'rate': rate,
+                    'amount': amount
+                })
         
-        # Calculate totals
-        subtotal = sum(item['amount'] for item in line_items)
+        # Calculate totals with a SIMD-reduced numpy sum instead of
+        # iterating the list of dicts in Python
+        amounts_arr = np.fromiter(
+            (item['amount'] for item in line_items),
+            dtype=np.float64, count=len(line_items)
+        )
+        subtotal = float(amounts_arr.sum())
         
         # Try to get tax from CSV, otherwise calculate
-        tax_amount = self.parse_number(first_row.get(mapping.get('tax_amount', ''), 0.0)) if 'tax_amount' in mapping else 0.0
-        tax_rate = self.parse_number(first_row.get(mapping.get('tax_rate', ''), 0.0)) if 'tax_rate' in mapping else 0.0
+        tax_amount = self.parse_number(first_row.get(tax_amount_col, 0.0)) if tax_amount_col else 0.0
+        tax_rate = self.parse_number(first_row.get(tax_rate_col, 0.0)) if tax_rate_col else 0.0
         
         # If tax_amount is provided but not rate, calculate rate
         if tax_amount > 0 and tax_rate == 0 and subtotal > 0:
@@ -228,20 +442,49 @@ class CSVParser:
             # Try to read the file based on extension
             try:
                 if file_ext == 'csv':
-                    # Read as CSV
+                    # Sniff the encoding from the first 64KB once, instead of
+                    # reading the whole file in UTF-8, failing, and reading
+                    # it all again in latin-1
+                    with open(file_path, 'rb') as f:
+                        head = f.read(65536)
+                    best = from_bytes(head).best()
+                    # Keep the historical utf-8/latin-1 pair: exotic guesses
+                    # on short samples mangle accents that latin-1 round-trips
+                    if best and best.encoding in ('utf_8', 'ascii'):
+                        encoding = 'utf-8'
+                    else:
+                        encoding = 'latin-1'
+
+                    # Very large exports are streamed chunk by chunk so the
+                    # whole file never sits in memory at once
+                    if os.path.getsize(file_path) > STREAM_MIN_BYTES:
+                        return self._parse_csv_streaming(file_path, encoding)
+
+                    # Read with the multithreaded Arrow reader; fall back to
+                    # the C engine for files it can't handle
                     try:
-                        df = pd.read_csv(file_path, encoding='utf-8')
+                        df = pd.read_csv(file_path, encoding=encoding, engine='pyarrow')
                     except UnicodeDecodeError:
                         df = pd.read_csv(file_path, encoding='latin-1')
+                    except Exception:
+                        df = pd.read_csv(file_path, encoding=encoding)
                 else:
-                    # Read as Excel
-                    df = pd.read_excel(file_path, engine='openpyxl')
+                    # Read as Excel with the Rust-based calamine reader;
+                    # openpyxl stays as fallback for files it can't open
+                    try:
+                        df = pd.read_excel(file_path, engine='calamine')
+                    except Exception:
+                        df = pd.read_excel(file_path, engine='openpyxl')
             except Exception as e:
                 return [], f"Could not read file: {str(e)}"
             
             if df.empty:
                 return [], "File is empty"
-            
+
+            # Clean the header once with pandas' vectorized string ops so no
+            # downstream step re-strips the same names per comparison
+            df.columns = df.columns.str.strip()
+
             # Detect column mapping
             mapping = self.detect_column_mapping(df.columns.tolist())
             
@@ -255,6 +498,58 @@ class CSVParser:
                 return [], "No valid invoices found"
             
             return invoices, None
-            
+
+        except Exception as e:
+            return [], f"Error parsing file: {str(e)}"
+
+    def _parse_csv_streaming(self, file_path: str, encoding: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Read a large CSV in chunks, accumulating rows per invoice.
+
+        Every row still ends up in the groups dict before any invoice is
+        parsed, so peak memory remains proportional to file size; what the
+        chunked read buys is avoiding a second whole-file DataFrame (the
+        single read_csv result plus its groupby copies) living in memory
+        at once.
+        """
+        try:
+            # Detect the mapping from a small sample read
+            sample = pd.read_csv(file_path, encoding=encoding, nrows=1000)
+            sample.columns = sample.columns.str.strip()
+            mapping = self.detect_column_mapping(sample.columns.tolist())
+
+            if not mapping:
+                return [], "Could not detect any recognizable columns"
+
+            invoice_col = mapping.get('invoice_number')
+            if invoice_col is None:
+                # Single-invoice file: nothing to group on, read it whole
+                df = pd.read_csv(file_path, encoding=encoding)
+                df.columns = df.columns.str.strip()
+                invoice = self.parse_invoice_rows(self._coerce_mapped_columns(df, mapping), mapping)
+                return ([invoice], None) if invoice else ([], "No valid invoices found")
+
+            # Accumulate per-invoice groups incrementally
+            groups: Dict[Any, List[pd.DataFrame]] = {}
+            for chunk in pd.read_csv(file_path, encoding=encoding, chunksize=STREAM_CHUNK_ROWS):
+                chunk.columns = chunk.columns.str.strip()
+                for invoice_num, group in chunk.groupby(invoice_col, sort=False,
+                                                        dropna=True, observed=True):
+                    if str(invoice_num).strip():
+                        groups.setdefault(invoice_num, []).append(group)
+
+            invoices = []
+            for frames in groups.values():
+                df_group = pd.concat(frames) if len(frames) > 1 else frames[0]
+                invoice_data = self.parse_invoice_rows(
+                    self._coerce_mapped_columns(df_group, mapping), mapping
+                )
+                if invoice_data:
+                    invoices.append(invoice_data)
+
+            if not invoices:
+                return [], "No valid invoices found"
+
+            return invoices, None
+
         except Exception as e:
             return [], f"Error parsing file: {str(e)}"
@@ -4,12 +4,13 @@ Generates sample CSV files in various accounting software formats
 to test the 180+ column mapping feature
 """
 
-import csv
 import random
 from datetime import datetime, timedelta
-from io import StringIO
 from typing import List, Dict, Tuple
 
+import numpy as np
+import pandas as pd
+
 # Sample data pools
 COMPANY_NAMES = [
     "Acme Corp", "TechStart Inc", "Global Systems LLC", "Digital Solutions",
@@ -40,6 +41,13 @@ SERVICES = [
     ("Custom Development", 150.00, 500.00)
 ]
 
+# Service pools as parallel arrays plus a shared generator so line-item
+# sampling is one C-level draw per column
+_rng = np.random.default_rng()
+_SERVICE_NAMES = np.array([s[0] for s in SERVICES])
+_SERVICE_MIN = np.array([s[1] for s in SERVICES])
+_SERVICE_MAX = np.array([s[2] for s in SERVICES])
+
 ADDRESSES = [
     ("123 Main St", "New York", "NY", "10001"),
     ("456 Oak Ave", "Los Angeles", "CA", "90001"),
@@ -203,6 +211,14 @@ CSV_FORMATS = {
 }
 
 
+# Header fingerprints so the parser can recognize a known vendor export
+# outright and skip fuzzy matching: frozenset(headers) -> {field: column}
+FORMAT_FINGERPRINTS = {
+    frozenset(fmt["columns"].values()): dict(fmt["columns"])
+    for fmt in CSV_FORMATS.values()
+}
+
+
 def generate_random_email(company_name: str) -> str:
     """Generate a random email based on company name"""
     domain = company_name.lower().replace(" ", "").replace(".", "")[:10]
@@ -217,19 +233,15 @@ def generate_random_address() -> Tuple[str, str, str, str]:
 
 def generate_line_items(num_items: int) -> List[Dict]:
     """Generate random line items"""
-    items = []
-    for _ in range(num_items):
-        service_name, min_rate, max_rate = random.choice(SERVICES)
-        quantity = round(random.uniform(1, 20), 1)
-        rate = round(random.uniform(min_rate, max_rate), 2)
-        amount = round(quantity * rate, 2)
-        items.append({
-            "description": service_name,
-            "quantity": quantity,
-            "rate": rate,
-            "amount": amount
-        })
-    return items
+    # One vectorized draw per column instead of per-item random calls
+    idx = _rng.integers(0, len(SERVICES), size=num_items)
+    quantities = _rng.uniform(1, 20, size=num_items).round(1)
+    rates = _rng.uniform(_SERVICE_MIN[idx], _SERVICE_MAX[idx]).round(2)
+    amounts = (quantities * rates).round(2)
+    return [
+        {"description": d, "quantity": float(q), "rate": float(r), "amount": float(a)}
+        for d, q, r, a in zip(_SERVICE_NAMES[idx], quantities, rates, amounts)
+    ]
 
 
 def generate_invoice_data(invoice_num: int, format_key: str) -> List[Dict]:
@@ -305,14 +317,11 @@ def generate_demo_csv(format_key: str = "quickbooks_online", num_invoices: int =
         rows = generate_invoice_data(invoice_num, format_key)
         all_rows.extend(rows)
     
-    # Create CSV
-    output = StringIO()
+    # Create CSV through pandas' C writer instead of row-by-row DictWriter
     fieldnames = list(columns.values())
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(all_rows)
-    
-    return output.getvalue(), fmt["name"]
+    csv_content = pd.DataFrame(all_rows, columns=fieldnames).to_csv(index=False)
+
+    return csv_content, fmt["name"]
 
 
 def get_available_formats() -> List[Dict]:
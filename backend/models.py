@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import uuid
+from uuid_utils import uuid7
 from enum import Enum
 
 # Enums
@@ -25,9 +25,9 @@ class InvoiceStatus(str, Enum):
 
 # Base Models
 class User(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     email: EmailStr
     hashed_password: str
     full_name: str
@@ -47,18 +47,18 @@ class UserLogin(BaseModel):
     password: str
 
 class Organization(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     name: str
     owner_id: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     settings: Dict[str, Any] = Field(default_factory=dict)
 
 class Branding(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     organization_id: str
     logo_url: Optional[str] = None
     primary_color: str = "#3B82F6"
@@ -67,9 +67,9 @@ class Branding(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class Upload(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     organization_id: str
     user_id: str
     filename: str
@@ -81,15 +81,17 @@ class Upload(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class InvoiceLineItem(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     description: str
     quantity: float = 1.0
     rate: float
     amount: float
 
 class Invoice(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     organization_id: str
     upload_id: str
     invoice_number: str
@@ -121,9 +123,9 @@ class Invoice(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class TaxRate(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     state: str
     state_code: str
     zip_code: Optional[str] = None
@@ -132,9 +134,9 @@ class TaxRate(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class TaxExemption(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", defer_build=True)
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     organization_id: str
     client_name: str
     certificate_number: str
@@ -1,56 +1,79 @@
-from typing import Dict, Optional, List
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, List
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
 
+# Static reference tables, built once at import and shared read-only across
+# every TaxService instance.
+
+# Simplified US state tax rates (as of 2024)
+# In production, this would be loaded from MongoDB
+_TAX_RATES: Mapping[str, float] = MappingProxyType({
+    'AL': 4.00, 'AK': 0.00, 'AZ': 5.60, 'AR': 6.50, 'CA': 7.25,
+    'CO': 2.90, 'CT': 6.35, 'DE': 0.00, 'FL': 6.00, 'GA': 4.00,
+    'HI': 4.00, 'ID': 6.00, 'IL': 6.25, 'IN': 7.00, 'IA': 6.00,
+    'KS': 6.50, 'KY': 6.00, 'LA': 4.45, 'ME': 5.50, 'MD': 6.00,
+    'MA': 6.25, 'MI': 6.00, 'MN': 6.88, 'MS': 7.00, 'MO': 4.23,
+    'MT': 0.00, 'NE': 5.50, 'NV': 6.85, 'NH': 0.00, 'NJ': 6.63,
+    'NM': 5.13, 'NY': 4.00, 'NC': 4.75, 'ND': 5.00, 'OH': 5.75,
+    'OK': 4.50, 'OR': 0.00, 'PA': 6.00, 'RI': 7.00, 'SC': 6.00,
+    'SD': 4.50, 'TN': 7.00, 'TX': 6.25, 'UT': 6.10, 'VT': 6.00,
+    'VA': 5.30, 'WA': 6.50, 'WV': 6.00, 'WI': 5.00, 'WY': 4.00,
+    'DC': 6.00
+})
+
+# Full state names for better matching
+_STATE_NAMES: Mapping[str, str] = MappingProxyType({
+    'ALABAMA': 'AL', 'ALASKA': 'AK', 'ARIZONA': 'AZ', 'ARKANSAS': 'AR', 'CALIFORNIA': 'CA',
+    'COLORADO': 'CO', 'CONNECTICUT': 'CT', 'DELAWARE': 'DE', 'FLORIDA': 'FL', 'GEORGIA': 'GA',
+    'HAWAII': 'HI', 'IDAHO': 'ID', 'ILLINOIS': 'IL', 'INDIANA': 'IN', 'IOWA': 'IA',
+    'KANSAS': 'KS', 'KENTUCKY': 'KY', 'LOUISIANA': 'LA', 'MAINE': 'ME', 'MARYLAND': 'MD',
+    'MASSACHUSETTS': 'MA', 'MICHIGAN': 'MI', 'MINNESOTA': 'MN', 'MISSISSIPPI': 'MS', 'MISSOURI': 'MO',
+    'MONTANA': 'MT', 'NEBRASKA': 'NE', 'NEVADA': 'NV', 'NEW HAMPSHIRE': 'NH', 'NEW JERSEY': 'NJ',
+    'NEW MEXICO': 'NM', 'NEW YORK': 'NY', 'NORTH CAROLINA': 'NC', 'NORTH DAKOTA': 'ND', 'OHIO': 'OH',
+    'OKLAHOMA': 'OK', 'OREGON': 'OR', 'PENNSYLVANIA': 'PA', 'RHODE ISLAND': 'RI', 'SOUTH CAROLINA': 'SC',
+    'SOUTH DAKOTA': 'SD', 'TENNESSEE': 'TN', 'TEXAS': 'TX', 'UTAH': 'UT', 'VERMONT': 'VT',
+    'VIRGINIA': 'VA', 'WASHINGTON': 'WA', 'WEST VIRGINIA': 'WV', 'WISCONSIN': 'WI', 'WYOMING': 'WY',
+    'DISTRICT OF COLUMBIA': 'DC', 'WASHINGTON DC': 'DC', 'WASHINGTON D.C.': 'DC'
+})
+
+# Precompiled alternations so each lookup walks the address once in C
+# instead of looping 50+ Python-level substring/regex checks.
+# Longer names first so 'WEST VIRGINIA' wins over 'VIRGINIA' and
+# 'WASHINGTON DC' over 'WASHINGTON'.
+_STATE_NAME_RE = re.compile(
+    '|'.join(sorted((re.escape(name) for name in _STATE_NAMES),
+                    key=len, reverse=True))
+)
+_STATE_CODE_RE = re.compile(r'\b(' + '|'.join(_TAX_RATES) + r')\b')
+
+
 class TaxService:
     def __init__(self):
-        self.tax_rates_db = self._load_tax_rates()
-        # Full state names for better matching
-        self.state_names = {
-            'ALABAMA': 'AL', 'ALASKA': 'AK', 'ARIZONA': 'AZ', 'ARKANSAS': 'AR', 'CALIFORNIA': 'CA',
-            'COLORADO': 'CO', 'CONNECTICUT': 'CT', 'DELAWARE': 'DE', 'FLORIDA': 'FL', 'GEORGIA': 'GA',
-            'HAWAII': 'HI', 'IDAHO': 'ID', 'ILLINOIS': 'IL', 'INDIANA': 'IN', 'IOWA': 'IA',
-            'KANSAS': 'KS', 'KENTUCKY': 'KY', 'LOUISIANA': 'LA', 'MAINE': 'ME', 'MARYLAND': 'MD',
-            'MASSACHUSETTS': 'MA', 'MICHIGAN': 'MI', 'MINNESOTA': 'MN', 'MISSISSIPPI': 'MS', 'MISSOURI': 'MO',
-            'MONTANA': 'MT', 'NEBRASKA': 'NE', 'NEVADA': 'NV', 'NEW HAMPSHIRE': 'NH', 'NEW JERSEY': 'NJ',
-            'NEW MEXICO': 'NM', 'NEW YORK': 'NY', 'NORTH CAROLINA': 'NC', 'NORTH DAKOTA': 'ND', 'OHIO': 'OH',
-            'OKLAHOMA': 'OK', 'OREGON': 'OR', 'PENNSYLVANIA': 'PA', 'RHODE ISLAND': 'RI', 'SOUTH CAROLINA': 'SC',
-            'SOUTH DAKOTA': 'SD', 'TENNESSEE': 'TN', 'TEXAS': 'TX', 'UTAH': 'UT', 'VERMONT': 'VT',
-            'VIRGINIA': 'VA', 'WASHINGTON': 'WA', 'WEST VIRGINIA': 'WV', 'WISCONSIN': 'WI', 'WYOMING': 'WY',
-            'DISTRICT OF COLUMBIA': 'DC', 'WASHINGTON DC': 'DC', 'WASHINGTON D.C.': 'DC'
-        }
-    
-    def _load_tax_rates(self) -> Dict[str, float]:
-        """Load fallback tax rates database"""
-        # Simplified US state tax rates (as of 2024)
-        # In production, this would be loaded from MongoDB
-        return {
-            'AL': 4.00, 'AK': 0.00, 'AZ': 5.60, 'AR': 6.50, 'CA': 7.25,
-            'CO': 2.90, 'CT': 6.35, 'DE': 0.00, 'FL': 6.00, 'GA': 4.00,
-            'HI': 4.00, 'ID': 6.00, 'IL': 6.25, 'IN': 7.00, 'IA': 6.00,
-            'KS': 6.50, 'KY': 6.00, 'LA': 4.45, 'ME': 5.50, 'MD': 6.00,
-            'MA': 6.25, 'MI': 6.00, 'MN': 6.88, 'MS': 7.00, 'MO': 4.23,
-            'MT': 0.00, 'NE': 5.50, 'NV': 6.85, 'NH': 0.00, 'NJ': 6.63,
-            'NM': 5.13, 'NY': 4.00, 'NC': 4.75, 'ND': 5.00, 'OH': 5.75,
-            'OK': 4.50, 'OR': 0.00, 'PA': 6.00, 'RI': 7.00, 'SC': 6.00,
-            'SD': 4.50, 'TN': 7.00, 'TX': 6.25, 'UT': 6.10, 'VT': 6.00,
-            'VA': 5.30, 'WA': 6.50, 'WV': 6.00, 'WI': 5.00, 'WY': 4.00,
-            'DC': 6.00
-        }
-    
+        self.tax_rates_db = _TAX_RATES
+        self.state_names = _STATE_NAMES
+        self._state_name_re = _STATE_NAME_RE
+        self._state_code_re = _STATE_CODE_RE
+
+    @lru_cache(maxsize=4096)
     def extract_state_from_address(self, address: Optional[str]) -> Optional[str]:
-        """Extract state code from address string using multiple strategies"""
+        """Extract state code from address string using multiple strategies.
+
+        Memoized: invoices from the same client repeat the same address, so
+        the regex scan runs once per distinct address instead of per call.
+        """
         if not address:
             return None
-        
+
         address_upper = address.upper()
-        
+
         # Strategy 1: Look for full state names first (most reliable)
-        for state_name, state_code in self.state_names.items():
-            if state_name in address_upper:
-                return state_code
-        
+        name_match = self._state_name_re.search(address_upper)
+        if name_match:
+            return self.state_names[name_match.group(0)]
+
         # Strategy 2: Look for state code followed by ZIP code pattern (STATE ZIP)
         # Pattern: state code followed by optional space and 5-digit ZIP
         zip_pattern = re.search(r'\b([A-Z]{2})\s*(\d{5}(?:-\d{4})?)\b', address_upper)
@@ -58,7 +81,7 @@ class TaxService:
             potential_state = zip_pattern.group(1)
             if potential_state in self.tax_rates_db:
                 return potential_state
-        
+
         # Strategy 3: Look for comma-separated city, state pattern
         # Pattern: ", STATE" where STATE is 2 letters followed by space or end
         comma_pattern = re.search(r',\s*([A-Z]{2})(?:\s|,|$)', address_upper)
@@ -66,37 +89,36 @@ class TaxService:
             potential_state = comma_pattern.group(1)
             if potential_state in self.tax_rates_db:
                 return potential_state
-        
+
         # Strategy 4: Look for state code as a standalone word (with word boundaries)
-        for state_code in self.tax_rates_db.keys():
-            pattern = r'\b' + state_code + r'\b'
-            if re.search(pattern, address_upper):
-                return state_code
-        
+        code_match = self._state_code_re.search(address_upper)
+        if code_match:
+            return code_match.group(1)
+
         return None
-    
-    def calculate_tax(self, amount: float, state_code: Optional[str] = None, 
+
+    def calculate_tax(self, amount: float, state_code: Optional[str] = None,
                      client_address: Optional[str] = None) -> Dict[str, float]:
         """Calculate tax for an invoice"""
         # Try to get state from code or address
         if not state_code and client_address:
             state_code = self.extract_state_from_address(client_address)
-        
+
         # Default to 0% if state not found
         tax_rate = 0.0
         if state_code and state_code in self.tax_rates_db:
             tax_rate = self.tax_rates_db[state_code]
-        
+
         tax_amount = amount * (tax_rate / 100)
-        
+
         return {
             'tax_rate': tax_rate,
             'tax_amount': round(tax_amount, 2),
             'total': round(amount + tax_amount, 2),
             'state': state_code
         }
-    
-    def check_exemption(self, organization_id: str, client_name: str, 
+
+    def check_exemption(self, organization_id: str, client_name: str,
                        state: str, db) -> bool:
         """Check if client has valid tax exemption"""
         # This would query MongoDB for exemptions